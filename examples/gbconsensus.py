@@ -135,7 +135,7 @@ def enumerate_efms():
 	irreversible_system = IrreversibleLinearSystem(S_int_final, irrev_int, nc_meta, [consumed_meta[7]], [])
 	algorithm = KShortestEFMAlgorithm(configuration)
 
-	efms = algorithm.enumerate(irreversible_system)
+	efms = list(algorithm.enumerate(irreversible_system))
 	decoded_efms = [{rx_names_int[i]:v for i,v in efm.attribute_value(efm.SIGNED_VALUE_MAP).items() if v != 0} for efm in efms]
 	decoded_efms_index = [{i:v for i,v in efm.attribute_value(efm.SIGNED_VALUE_MAP).items() if v != 0} for efm in efms]
 	decoded = [' | '.join([rx_names_int[i] for i in efmi.get_active_indicator_varids()]) for efmi in efms]
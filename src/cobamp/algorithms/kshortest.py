@@ -15,13 +15,17 @@ import abc
 import warnings
 from itertools import chain
 
-from numpy import concatenate, array, zeros, hstack, ones, identity
+from pathos.pools import _ProcessPool
+from numpy import concatenate, array, zeros, hstack, ones, identity, cumsum, fromiter, repeat, add, absolute, int32, \
+	float64, asarray, ndarray, arange, vstack, flatnonzero, int8, isnan, where, column_stack
+from scipy.sparse import block_diag, coo_matrix, csr_matrix, hstack as sparse_hstack
 
 from cobamp.core.linear_systems import IrreversibleLinearPatternSystem, VAR_BINARY
 from cobamp.core.optimization import LinearSystemOptimizer, KShortestSolution
+from cobamp.utilities.parallel import MP_THREADS
 from cobamp.utilities.property_management import PropertyDictionary
 
-decompose_list = lambda a: chain.from_iterable(map(lambda i: i if isinstance(i, list) else [i], a))
+decompose_list = lambda a: chain.from_iterable(i if isinstance(i, list) else (i,) for i in a)
 
 MAX_POPULATE_SOLS_DEFAULT = 2100000000
 
@@ -58,6 +62,10 @@ K_SHORTEST_OPROPERTY_FORCE_NON_CANCELLATION = 'FORCE_NON_CANCEL'
 K_SHORTEST_OPROPERTY_BIG_M_VALUE = "BIGMVALUE"
 K_SHORTEST_OPROPERTY_WORKMEMORY = 'WORKMEM'
 K_SHORTEST_OPROPERTY_TIMELIMIT = 'TIMELIMIT'
+K_SHORTEST_OPROPERTY_POOL_INTENSITY = 'POOL_INTENSITY'
+K_SHORTEST_OPROPERTY_POOL_REPLACE = 'POOL_REPLACE'
+K_SHORTEST_OPROPERTY_MIP_EMPHASIS = 'MIP_EMPHASIS'
+K_SHORTEST_OPROPERTY_FP_HEURISTIC = 'FP_HEURISTIC'
 
 kshortest_mandatory_properties = {
 	K_SHORTEST_MPROPERTY_METHOD: [K_SHORTEST_METHOD_ITERATE, K_SHORTEST_METHOD_POPULATE],
@@ -72,7 +80,11 @@ kshortest_optional_properties = {
 	K_SHORTEST_OPROPERTY_FORCE_NON_CANCELLATION: bool,
 	K_SHORTEST_OPROPERTY_WORKMEMORY: lambda x: isinstance(x, (float, int)) or x == None,
 	K_SHORTEST_OPROPERTY_BIG_M_CONSTRAINTS: bool,
-	K_SHORTEST_OPROPERTY_TIMELIMIT: lambda x: isinstance(x, (float, int))
+	K_SHORTEST_OPROPERTY_TIMELIMIT: lambda x: isinstance(x, (float, int)),
+	K_SHORTEST_OPROPERTY_POOL_INTENSITY: [0, 1, 2, 3, 4],
+	K_SHORTEST_OPROPERTY_POOL_REPLACE: [0, 1, 2],
+	K_SHORTEST_OPROPERTY_MIP_EMPHASIS: [0, 1, 2, 3, 4, 5],
+	K_SHORTEST_OPROPERTY_FP_HEURISTIC: [-1, 0, 1, 2]
 }
 
 
@@ -84,6 +96,10 @@ class KShortestProperties(PropertyDictionary):
 		- K_SHORTEST_METHOD_ITERATE : Iterative enumeration (one EFM at a time)
 		- K_SHORTEST_METHOD_POPULATE : Enumeration by size (EFMs of a certain size at a time)
 
+	The K_SHORTEST_OPROPERTY_POOL_INTENSITY, K_SHORTEST_OPROPERTY_POOL_REPLACE, K_SHORTEST_OPROPERTY_MIP_EMPHASIS and
+	K_SHORTEST_OPROPERTY_FP_HEURISTIC properties override the CPLEX solution pool parameters (mip.pool.intensity,
+	mip.pool.replace, emphasis.mip and mip.strategy.fpheur respectively) and are ignored by other solvers.
+
 	"""
 
 	def __init__(self):
@@ -96,6 +112,10 @@ class KShortestProperties(PropertyDictionary):
 		self[K_SHORTEST_OPROPERTY_BIG_M_CONSTRAINTS] = False
 		self[K_SHORTEST_OPROPERTY_MAXSOLUTIONS] = MAX_POPULATE_SOLS_DEFAULT
 		self[K_SHORTEST_OPROPERTY_TIMELIMIT] = 0
+		self[K_SHORTEST_OPROPERTY_POOL_INTENSITY] = 4
+		self[K_SHORTEST_OPROPERTY_POOL_REPLACE] = 2
+		self[K_SHORTEST_OPROPERTY_MIP_EMPHASIS] = 2
+		self[K_SHORTEST_OPROPERTY_FP_HEURISTIC] = 1
 
 
 class KShortestEnumerator(object):
@@ -108,7 +128,8 @@ class KShortestEnumerator(object):
 	ENUMERATION_METHOD_POPULATE = 'populate'
 
 	def __init__(self, linear_system, m_value=None, force_non_cancellation=True, is_efp_problem=False, n_threads=0,
-				 workmem=None, force_big_m=False, max_populate_sols=MAX_POPULATE_SOLS_DEFAULT, max_time=0):
+				 workmem=None, force_big_m=False, max_populate_sols=MAX_POPULATE_SOLS_DEFAULT, max_time=0, pool_intensity=4,
+				 pool_replace=2, mip_emphasis=2, fp_heuristic=1):
 
 		"""
 
@@ -118,6 +139,9 @@ class KShortestEnumerator(object):
 
 			linear_system: A KShortestCompatibleLinearSystem/<LinearSystem> subclass
 
+			pool_intensity, pool_replace, mip_emphasis, fp_heuristic: Values for the CPLEX mip.pool.intensity,
+			mip.pool.replace, emphasis.mip and mip.strategy.fpheur parameters. Ignored by other solvers.
+
 		"""
 
 		linear_system.build_problem()
@@ -133,6 +157,9 @@ class KShortestEnumerator(object):
 		# TODO: Find a way to estimate the best possible value for this
 		self.__m_value = 10e6 if m_value == None else m_value
 		self.__max_time = max_time
+		self.__n_threads, self.__workmem = n_threads, workmem
+		self.__pool_intensity, self.__pool_replace = pool_intensity, pool_replace
+		self.__mip_emphasis, self.__fp_heuristic = mip_emphasis, fp_heuristic
 
 		# Open log files
 		# self.resf = open('results', 'w')
@@ -143,10 +170,13 @@ class KShortestEnumerator(object):
 		# self.is_efp_problem = isinstance(linear_system, IrreversibleLinearPatternSystem)
 		self.subset_problem = isinstance(linear_system, IrreversibleLinearPatternSystem)
 		self.is_efp_problem = is_efp_problem
+		# EFP cuts use the full solution length as right-hand side, so length overrides are masked out
+		self.__length_override_mask = 0 if is_efp_problem else 1
 
 		# Setup k-shortest constraints
 		self.indicator_map = {}
 		self.__ivars = []
+		self.__dvar_vars = [self.model.model.variables[i] for i in self.__dvars]
 		no_indicators = (force_big_m) or linear_system.solver != 'CPLEX'
 		# big_m = force_big_m and (no_indicators)
 		if no_indicators:
@@ -157,6 +187,11 @@ class KShortestEnumerator(object):
 		else:
 			self.__add_kshortest_indicators()
 
+		self.__ivar_vars = [self.model.model.variables[i] for i in self.__ivars]
+		# unit coefficients shared by the default objective and the size constraint (read-only)
+		self.__ivar_ones = ones(len(self.__ivars))
+		self.__build_dvar_groups()
+
 		if not self.is_efp_problem:
 			self.__add_exclusivity_constraints()
 		else:
@@ -167,6 +202,7 @@ class KShortestEnumerator(object):
 
 		self.__size_constraint = None
 		self.__efp_auxiliary_map = None
+		self.__efp_aux_arr = None
 
 		if self.is_efp_problem:
 			self.__add_efp_auxiliary_constraints()
@@ -176,8 +212,10 @@ class KShortestEnumerator(object):
 		self.__set_objective()
 		self.__integer_cuts = []
 		self.__exclusion_cuts = []
+		self.__cut_supports = set()
+		self.__checkpoints = {}
+		self.__checkpoint_counter = 0
 		self.set_size_constraint(1)
-		self.__current_size = 1
 		self.optimizer = LinearSystemOptimizer(self.model, build=False)
 		self.__vnames = self.model.model._get_variables_names()
 		self.__ivar_objs = self.model.get_stuff('var',
@@ -245,12 +283,12 @@ class KShortestEnumerator(object):
 
 		instance.parameters.clocktype.set(1)
 		instance.parameters.advance.set(0)
-		instance.parameters.mip.strategy.fpheur.set(1)
-		instance.parameters.emphasis.mip.set(2)
+		instance.parameters.mip.strategy.fpheur.set(self.__fp_heuristic)
+		instance.parameters.emphasis.mip.set(self.__mip_emphasis)
 		instance.parameters.mip.limits.populate.set(self.__max_populate_dflt)
-		instance.parameters.mip.pool.intensity.set(4)
+		instance.parameters.mip.pool.intensity.set(self.__pool_intensity)
 		instance.parameters.mip.pool.absgap.set(0)
-		instance.parameters.mip.pool.replace.set(2)
+		instance.parameters.mip.pool.replace.set(self.__pool_replace)
 		# instance.parameters.lpmethod.set(6)
 		#		instance.parameters.tune_problem()
 		if self.__max_time != 0:
@@ -284,22 +322,16 @@ class KShortestEnumerator(object):
 		:param equality: Boolean flag specifying whether the constraint is an equality
 		:return:
 		"""
+		value_maps = []
 		for sol in sols:
 			if isinstance(sol, KShortestSolution):
-				self.__add_integer_cut(sol.var_values(), efp_cut=self.is_efp_problem, equality=equality,
-									   length_override=length_override)
+				value_maps.append(sol.var_values())
 			elif isinstance(sol, list) or isinstance(sol, tuple):
-				values = {i: 0 for i in range(len(self.model.model.variables))}
-				for k in sol:
-					dvars = self.__dvar_mapping[k]
-					if isinstance(dvars, (list, tuple)):
-						for v in dvars:
-							values[self.indicator_map[self.__dvars[v]]] = 1
-					else:
-						values[self.indicator_map[self.__dvars[dvars]]] = 1
-					values[k] = 1
-				self.__add_integer_cut(values, efp_cut=self.is_efp_problem, equality=equality,
-									   length_override=length_override)
+				values = zeros(len(self.model.model.variables))
+				groups = [self.__dvar_group_index[k] for k in sol]
+				values[self.__indicator_arr[self.__dvar_indicator_csr[groups].indices]] = 1
+				value_maps.append(values)
+		self.__add_integer_cuts(value_maps, equality=equality, length_override=length_override)
 
 	def exclude_solutions(self, sols):
 
@@ -342,20 +374,23 @@ class KShortestEnumerator(object):
 		for i in range(0, len(self.__dvars), chunksize):
 			# print('Adding chunk:',i,i+chunksize)
 			dvl = self.__dvars[i:i + chunksize]
-			self.__add_kshortest_indicators_from_dvar(dvl)
+			self.__add_kshortest_indicators_from_dvar(dvl, self.__dvar_vars[i:i + chunksize])
 
-	def __add_kshortest_indicators_from_dvar(self, dvars):
+	def __add_kshortest_indicators_from_dvar(self, dvars, dvar_vars):
 		"""
 		Adds indicator variable to a copy of the supplied linear problem.
 		This uses the __dvars map to obtain a list of all variables and assigns an indicator to them.
 		:param dvars: An iterable with the variables to add the indicators to
+		:param dvar_vars: A list with the solver variable instances for dvars
 		-------
 
 		"""
 		ilb, iub = [0] * 5, [1] * 5
 		itype = VAR_BINARY
+		# coefficients are all in {-1, 0, 1}, so the blocks are built as int8 and only cast when added to the model
 		template_matrix = array(
-			[[1, 1, 0, 0, 0], [0, -1, 1, 0, 0], [-1, 0, 0, 1, 0], [0, 0, 0, -1, 1], [0, 0, 0, 0, 0], [0, 0, 0, 0, 0]]
+			[[1, 1, 0, 0, 0], [0, -1, 1, 0, 0], [-1, 0, 0, 1, 0], [0, 0, 0, -1, 1], [0, 0, 0, 0, 0], [0, 0, 0, 0, 0]],
+			dtype=int8
 		)
 
 		template_blb, template_bub = [1, 0, 0, 0, 0, 0], [1, None, 0, None, 0, None]
@@ -369,21 +404,21 @@ class KShortestEnumerator(object):
 		for vars in zip(*helpers):
 			vlist.extend(self.model.add_variables_to_model(vars, lb=ilb, ub=iub, var_types=itype))
 		trows, tcols = template_matrix.shape
-		template_full = zeros((trows * len(dvars), tcols * len(dvars)))
-		diag = zeros((trows * len(dvars), len(dvars)))
-		crow = zeros((trows * len(dvars),))
+		nrows, ndvars = trows * len(dvars), len(dvars)
+		block_rows = arange(ndvars) * trows
+
+		template_full = block_diag([template_matrix] * ndvars, format='csr', dtype=int8)
+		diag = coo_matrix((ones(2 * ndvars, dtype=int8), (concatenate([block_rows + 4, block_rows + 5]), concatenate(
+			[arange(ndvars)] * 2))), shape=(nrows, ndvars))
+		crow = coo_matrix((-ones(ndvars, dtype=int8), (block_rows + 5, zeros(ndvars, dtype=int32))), shape=(nrows, 1))
 		indicators = []
-		for i in range(len(dvars)):
-			template_full[i * trows: (i + 1) * trows, i * tcols:(i + 1) * tcols] = template_matrix
-			diag[(i * trows) + 4][i] = 1
-			diag[(i * trows) + 5][i] = 1
-			crow[(i * trows) + 5] = -1
-			indicators.append(tuple([(i * trows) + 4, len(dvars) + (i * tcols) + 2, 1]))
-			indicators.append(tuple([(i * trows) + 5, len(dvars) + (i * tcols) + 4, 1]))
-
-		nrowmat = hstack([diag, template_full, crow.reshape(-1, 1)])
+		for i in range(ndvars):
+			indicators.append(tuple([(i * trows) + 4, ndvars + (i * tcols) + 2, 1]))
+			indicators.append(tuple([(i * trows) + 5, ndvars + (i * tcols) + 4, 1]))
+
+		nrowmat = sparse_hstack([diag, template_full, crow], format='csr', dtype=float64)
 		vlist += [self.model.get_c_variable()]
-		vlist = [self.model.model.variables[i] for i in dvars] + vlist
+		vlist = dvar_vars + vlist
 		new_ivars = [(i * 5) + offset for i in range(len(dvars))]
 		self.__ivars.extend(new_ivars)
 		self.model.add_rows_to_model(nrowmat, row_blb, row_bub, only_nonzero=True, indicator_rows=indicators,
@@ -409,38 +444,54 @@ class KShortestEnumerator(object):
 		ivar_instances = self.model.add_variables_to_model(['i' + str(i) for i in range(len(dvars))],
 														   lb=[0] * len(dvars), ub=[1] * len(dvars),
 														   var_types=VAR_BINARY)
-		dvar_instances = [self.model.model.variables[i] for i in dvars]
-		vlist = list(chain(*list(zip(dvar_instances, ivar_instances))))
+		vlist = list(chain(*list(zip(self.__dvar_vars, ivar_instances))))
 		self.__ivars = [i + offset for i in range(len(dvars))]
 
 		self.model.add_rows_to_model(nrowmat, [None] * (len(dvars) * 2), [0] * (len(dvars) * 2), only_nonzero=True,
 									 vars=vlist)
 		self.indicator_map = dict(zip(dvars, self.__ivars))
 
+	def __build_dvar_groups(self):
+		"""
+		Flattens the dvar mapping into CSR-like arrays (dvar positions for each flux and the offsets where each flux's
+		group starts), along with the indicator variable index for each dvar position. The same structure is kept as a
+		flux-by-dvar membership matrix. Used to vectorize the construction of integer cuts.
+		"""
+		groups = [dvl if isinstance(dvl, (tuple, list)) else [dvl] for dvl in self.__dvar_mapping.values()]
+		lengths = [len(dvl) for dvl in groups]
+		self.__indicator_arr = asarray(self.__ivars, dtype=int32)
+		self.__dvar_group_keys = array(list(self.__dvar_mapping.keys()))
+		self.__dvar_group_index = {k: i for i, k in enumerate(self.__dvar_mapping.keys())}
+		self.__dvar_group_values = array(list(chain(*groups)), dtype=int32)
+		self.__dvar_group_offsets = concatenate([[0], cumsum(lengths)]).astype(int32)
+		self.__dvar_groups_flat = self.__indicator_arr[self.__dvar_group_values]
+		self.__dvar_indicator_csr = csr_matrix(
+			(ones(len(self.__dvar_group_values), dtype=int8), self.__dvar_group_values, self.__dvar_group_offsets),
+			shape=(len(groups), len(self.__ivars)))
+
 	def __add_efp_auxiliary_constraints(self):
 		"""
 		Adds indicator constraints according to the EFP formulation by Kaleta et al.
 		"""
 		self.__efp_auxiliary_map = {}
 		itype = VAR_BINARY
-		indicator_vars = [self.model.model.variables[v] for v in self.__ivars]
+		indicator_vars = self.__ivar_vars
 		ilb, iub = [0] * len(indicator_vars), [1] * len(indicator_vars)
 		offset = len(self.model.model.variables)
 		helpers = self.model.add_variables_to_model(['efp_h' + str(i) for i in range(len(indicator_vars))], lb=ilb,
 													ub=iub, var_types=itype)
 
-		self.__efp_auxiliary_map = dict(zip(self.__ivars, [offset + i for i in range(len(helpers))]))
+		self.__efp_aux_arr = offset + arange(len(helpers), dtype=int32)
+		self.__efp_auxiliary_map = dict(zip(self.__ivars, self.__efp_aux_arr.tolist()))
 		vlist = indicator_vars + helpers
 		mat_template = identity(len(self.indicator_map))
-		mat = hstack([mat_template, -mat_template])
-		rhs_l = [0] * len(self.indicator_map)
-		rhs_u = [None] * len(self.indicator_map)
-		## Adding MILP2
+		## MILP2 rows followed by the MILP4 row, added in a single batch
+		mat = vstack([hstack([mat_template, -mat_template]),
+					  hstack([zeros([1, len(indicator_vars)]), ones([1, len(helpers)])])])
+		rhs_l = [0] * len(self.indicator_map) + [1]
+		rhs_u = [None] * len(self.indicator_map) + [None]
 		self.model.add_rows_to_model(mat, rhs_l, rhs_u, only_nonzero=True, indicator_rows=None, vars=vlist,
 									 names=None)
-		## Adding MILP4
-		self.model.add_rows_to_model(ones([1, len(indicator_vars)]), [1], [None], only_nonzero=True,
-									 indicator_rows=None, vars=helpers, names=None)
 
 	def __add_exclusivity_constraints(self):
 		"""
@@ -450,19 +501,14 @@ class KShortestEnumerator(object):
 		-------
 
 		"""
-		exclusive_dvars = {k: v for k, v in self.__dvar_mapping.items() if isinstance(v, (tuple, list))}
+		exclusive_dvars = [v for v in self.__dvar_mapping.values() if isinstance(v, (tuple, list))]
 		M, N = len(exclusive_dvars), len(self.__dvars)
-		smat = zeros((M, N))
-		for k, n in enumerate(exclusive_dvars.items()):
-			idx, v = n
-			if not isinstance(v, (tuple, list)):
-				v = array([v])
-			else:
-				v = array(v)
-			smat[k][v] = 1
+		rows = repeat(arange(M), [len(v) for v in exclusive_dvars])
+		cols = array(list(chain(*exclusive_dvars)), dtype=int32)
+		smat = coo_matrix((ones(len(cols)), (rows, cols)), shape=(M, N)).tocsr()
 
 		self.model.add_rows_to_model(smat, [None] * M, [1] * M, True,
-									 vars=[self.model.model.variables[self.indicator_map[k]] for k in self.__dvars])
+									 vars=self.__ivar_vars)
 
 	def __set_objective(self, mask=None):
 		"""
@@ -471,8 +517,8 @@ class KShortestEnumerator(object):
 		-------
 
 		"""
-		vars = [self.model.model.variables[i] for i in self.__ivars]
-		self.model.set_objective(ones(len(vars), ) if isinstance(mask, type(None)) else mask, minimize=True, vars=vars)
+		vars = self.__ivar_vars
+		self.model.set_objective(self.__ivar_ones if isinstance(mask, type(None)) else mask, minimize=True, vars=vars)
 
 	def __integer_cut_count(self):
 		"""
@@ -485,48 +531,84 @@ class KShortestEnumerator(object):
 
 		return len(self.__integer_cuts)
 
-	def __add_integer_cut(self, value_map, efp_cut=False, equality=False, length_override=1, eps=1e-6):
+	def __active_dvar_groups(self, value_map, eps=1e-6):
+		"""
+		Returns a boolean ndarray flagging which fluxes (dvar groups) have at least one active indicator in value_map.
+		"""
+		flat = self.__dvar_groups_flat
+		if isinstance(value_map, ndarray):
+			values = value_map[flat]
+		else:
+			values = fromiter((value_map[i] for i in flat), dtype=float64, count=flat.size)
+		return add.reduceat(absolute(values), self.__dvar_group_offsets[:-1]) > eps
+
+	def __integer_cut_row(self, value_map, equality, length_override, eps):
+		"""
+		Computes the solver variable indices and right-hand side of the integer cut for a map of flux values. Returns
+		None if the cut is an inequality redundant with a previously added one.
+		"""
+		active = self.__active_dvar_groups(value_map, eps)
+		cut_dvars = self.__dvar_indicator_csr[flatnonzero(active)].indices
+		indicator_idx = self.__indicator_arr[cut_dvars].tolist()
+
+		cut_length = int(active.sum())
+		rhs_value = cut_length - (length_override * self.__length_override_mask)
+
+		# an inequality cut with the same support and right-hand side as a previous one is redundant
+		support = (frozenset(indicator_idx), rhs_value)
+		if not equality:
+			if support in self.__cut_supports:
+				return None
+			self.__cut_supports.add(support)
+
+		if self.is_efp_problem:
+			indicator_idx = indicator_idx + self.__efp_aux_arr[cut_dvars].tolist()
+		return indicator_idx, rhs_value
+
+	def __add_integer_cuts(self, value_maps, equality=False, length_override=1, eps=1e-6):
 		"""
-		Adds an integer cut based on a map of flux values (from a solution).
+		Adds integer cuts based on maps of flux values (from solutions). All cuts are added to the model at once. For
+		EFP problems, cuts also include the auxiliary variables.
 
 		Parameters
 
 		----------
 
-			value_map: A dictionary mapping solver variables with values
+			value_maps: An Iterable with ndarrays containing the values of each solver variable, ordered by variable
+			index. Dictionaries mapping variable indices with values are also accepted.
+
+			equality: Boolean value indicating whether the solutions are to be forced instead of excluded.
 
-			force_sol: Boolean value indicating whether the solution is to be excluded or forced.
+			length_override: Value subtracted from the solution size to obtain the right-hand side of each cut.
 
 		-------
 
 		"""
-		if efp_cut:
+		if self.is_efp_problem:
 			assert self.__efp_auxiliary_map is not None, 'Error: trying to set an integer cut for an EFP problem without any auxiliary variable'
 
-		cut_length, cut_vars = 0, []
-
-		for var, dvl in self.__dvar_mapping.items():
-			if not isinstance(dvl, (tuple, list)):
-				dvl = [dvl]
-			dvars_idx = [self.__dvars[k] for k in dvl]
-			indicator_idx = [self.indicator_map[k] for k in dvars_idx]
-			if sum([abs(value_map[i]) for i in indicator_idx]) > eps:
-				cut_vars.extend([self.model.model.variables[k] for k in indicator_idx])
-				if efp_cut:
-					cut_vars.extend([self.model.model.variables[self.__efp_auxiliary_map[k]] for k in indicator_idx])
-				cut_length += 1
-
-		rhs_value = cut_length - (length_override * int(not efp_cut))
-		cut = self.model.add_rows_to_model(
-			S_new=ones((1, len(cut_vars))),
-			b_lb=[rhs_value if equality else None],
-			b_ub=[rhs_value],
+		cut_rows = [self.__integer_cut_row(value_map, equality, length_override, eps) for value_map in
+					value_maps]
+		cut_rows = [row for row in cut_rows if row is not None]
+		if len(cut_rows) == 0:
+			return
+
+		cols, rhs = list(zip(*cut_rows))
+		indptr = concatenate([[0], cumsum([len(c) for c in cols])])
+		cut_matrix = csr_matrix((ones(indptr[-1]), concatenate(cols), indptr),
+								shape=(len(cols), len(self.model.model.variables)))
+		first_cut = len(self.__integer_cuts)
+		names = ['_'.join([str(k) for k in ['IC_OV', length_override, 'EQ' if equality else 'LE', first_cut + i]])
+				 for i in range(len(cols))]
+
+		cuts = self.model.add_rows_to_model(
+			S_new=cut_matrix,
+			b_lb=list(rhs) if equality else [None] * len(rhs),
+			b_ub=list(rhs),
 			only_nonzero=True,
-			vars=cut_vars
+			names=names
 		)
-		cut[0].name = '_'.join(
-			[str(k) for k in ['IC_OV', length_override, 'EQ' if equality else 'LE', len(self.__integer_cuts)]])
-		self.__integer_cuts.append(cut)
+		self.__integer_cuts.extend(cuts)
 
 	def set_size_constraint(self, start_at, equal=False):
 		"""
@@ -549,8 +631,8 @@ class KShortestEnumerator(object):
 			cns = self.model.model.constraints['KSH_SizeConstraint_']
 			self.model.set_constraint_bounds([cns], [start_at], [start_at if equal else None])
 		else:
-			c = ones((1, len(self.__ivars)))
-			vars = [self.model.model.variables[i] for i in self.__ivars]
+			c = self.__ivar_ones.reshape(1, -1)
+			vars = self.__ivar_vars
 			constraint = \
 			self.model.add_rows_to_model(c, [start_at], [start_at if equal else None], only_nonzero=False, vars=vars,
 										 names=['KSH_SizeConstraint_'])[0]
@@ -580,7 +662,7 @@ class KShortestEnumerator(object):
 			status = sol.status()
 			# print('Solution status: ',self.model.model.problem.solution.get_status())
 			if status == 'optimal' or (status != 'infeasible' and allow_suboptimal):
-				var_values = dict(zip(list(range(len(sol.x()))), sol.x()))
+				var_values = asarray(sol.x(), dtype=float64)
 				sol = KShortestSolution(var_values, status, self.indicator_map, self.__dvar_mapping, self.__dvars,
 										names=self.__vnames)
 				return sol
@@ -604,11 +686,10 @@ class KShortestEnumerator(object):
 		try:
 			rawsols = self.optimizer.populate(999999)
 			for sol in rawsols:
-				var_values = dict(zip(list(range(len(sol.x()))), sol.x()))
+				var_values = asarray(sol.x(), dtype=float64)
 				sols.append(KShortestSolution(var_values, None, self.indicator_map, self.__dvar_mapping, self.__dvars,
 											  names=self.__vnames))
-			for sol in sols:
-				self.__add_integer_cut(sol.var_values(), efp_cut=self.is_efp_problem)
+			self.__add_integer_cuts([sol.var_values() for sol in sols])
 			return sols
 		except Exception as e:
 			raise e
@@ -662,6 +743,57 @@ class KShortestEnumerator(object):
 				print('No solutions or error occurred at size ', i, e.args)
 				raise e
 
+	def populate_parallel(self, sizes, workers=MP_THREADS):
+		"""
+		Populates several solution sizes at once by dispatching each size to a worker process holding a copy of this
+		enumerator. Sizes are solved in batches of at most `workers` consecutive sizes; each worker only knows the
+		solutions accepted up to the previous batch, so solutions that contain a smaller solution from the same batch
+		are discarded when merging. Accepted solutions are cut from this enumerator as in <population_iterator>.
+		Not available for EFP problems, since elementary flux patterns are not support-minimal.
+
+		Parameters
+
+		----------
+
+			sizes: An Iterable[int] with the solution sizes to populate
+
+			workers: Number of worker processes
+
+		Returns a list with one list of KShortestSolution instances per size, in increasing size order.
+
+		-------
+
+		"""
+		assert not self.is_efp_problem, 'Error: parallel population is not supported for EFP problems'
+		sizes = sorted(set(sizes))
+		workers = max(1, min(workers, len(sizes)))
+		accepted, results = [], []
+		pool = _ProcessPool(
+			processes=workers,
+			initializer=_populate_pool_initializer,
+			initargs=(self, max(1, MP_THREADS // workers))
+		)
+		try:
+			for i in range(0, len(sizes), workers):
+				supports = [tuple(sup) for sup in accepted]
+				batch = pool.map(_populate_size_function, [(size, supports) for size in sizes[i:i + workers]])
+				for size, var_values_list in sorted(batch, key=lambda x: x[0]):
+					size_sols = []
+					for var_values in var_values_list:
+						support = frozenset(self.__dvar_group_keys[self.__active_dvar_groups(var_values)].tolist())
+						if any(sup <= support for sup in accepted):
+							continue
+						sol = KShortestSolution(var_values, None, self.indicator_map, self.__dvar_mapping,
+												self.__dvars, names=self.__vnames)
+						accepted.append(support)
+						size_sols.append(sol)
+					self.__add_integer_cuts([sol.var_values() for sol in size_sols])
+					results.append(size_sols)
+		finally:
+			pool.close()
+			pool.join()
+		return results
+
 	def populate_current_size(self):
 		"""
 
@@ -685,9 +817,83 @@ class KShortestEnumerator(object):
 		if sol is None:
 			raise Exception('Solution is empty')
 		if cut:
-			self.__add_integer_cut(sol.var_values(), efp_cut=self.is_efp_problem)
+			self.__add_integer_cuts([sol.var_values()])
 		return sol
 
+	def __setstate__(self, state):
+		"""
+		Restores a pickled enumerator. The optlang model does not keep solver parameters when serialized and recreates
+		its variables and constraints, so parameters are reapplied and cached references are rebound by name.
+		"""
+		self.__dict__.update(state)
+		self.__set_model_parameters()
+		self.model.set_number_of_threads(self.__n_threads)
+		if self.__workmem != None:
+			self.model.set_working_memory_limit(self.__workmem)
+		variables, constraints = self.model.model.variables, self.model.model.constraints
+		self.__ivar_objs = [variables[var.name] for var in self.__ivar_objs]
+		self.__ivar_vars = [variables[var.name] for var in self.__ivar_vars]
+		self.__dvar_vars = [variables[var.name] for var in self.__dvar_vars]
+		self.__integer_cuts = [constraints[cns.name] for cns in self.__integer_cuts]
+
+	def __remove_integer_cuts(self, start):
+		"""
+		Removes the integer cuts added after the first `start` cuts from the model in a single update.
+		"""
+		if len(self.__integer_cuts) > start:
+			self.model.model.remove(self.__integer_cuts[start:])
+			self.model.model.update()
+			del self.__integer_cuts[start:]
+
+	def checkpoint(self, tag=None):
+		"""
+		Records the current set of integer cuts (from enumerated, excluded or forced solutions) so that the enumeration
+		can later return to this point with <rollback>.
+
+		Parameters
+
+		----------
+
+			tag: A hashable identifier for the checkpoint, which must not be in use by an existing checkpoint.
+			Defaults to an integer taken from a counter that only increases for this enumerator.
+
+		Returns the checkpoint tag.
+
+		-------
+
+		"""
+		# checkpoints are ordered by when they were recorded, so rollback can discard the ones that came after
+		order = self.__checkpoint_counter
+		self.__checkpoint_counter += 1
+		if tag is None:
+			tag = order
+			while tag in self.__checkpoints:
+				tag += 1
+		assert tag not in self.__checkpoints, 'Error: checkpoint ' + str(tag) + ' already exists'
+		self.__checkpoints[tag] = (order, len(self.__integer_cuts), set(self.__cut_supports))
+		return tag
+
+	def rollback(self, tag):
+		"""
+		Removes every integer cut added since the checkpoint identified by tag was recorded. Checkpoints recorded after
+		it are discarded. Size constraints, objective and indicator activity are not changed.
+
+		Parameters
+
+		----------
+
+			tag: A checkpoint tag returned by <checkpoint>
+
+		-------
+
+		"""
+		assert tag in self.__checkpoints, 'Error: unknown checkpoint ' + str(tag)
+		order, n_cuts, supports = self.__checkpoints[tag]
+		self.optimizer.reset()
+		self.__remove_integer_cuts(n_cuts)
+		self.__cut_supports = set(supports)
+		self.__checkpoints = {k: v for k, v in self.__checkpoints.items() if v[0] <= order}
+
 	def reset_enumerator_state(self):
 		"""
 
@@ -696,15 +902,30 @@ class KShortestEnumerator(object):
 		-------
 
 		"""
-		self.optimizer = LinearSystemOptimizer(self.model, build=False)
-		self.model.model.remove(self.__integer_cuts)
-		self.model.model.update()
-		self.__integer_cuts = []
+		self.optimizer.reset()
+		self.__remove_integer_cuts(0)
+		self.__cut_supports.clear()
+		self.__checkpoints.clear()
 		self.set_size_constraint(1)
 		self.__set_objective()
 		self.set_indicator_activity()
 
 
+def _populate_pool_initializer(enumerator, threads):
+	global _enumerator
+	_enumerator = enumerator
+	_enumerator.model.set_number_of_threads(threads)
+
+
+def _populate_size_function(job):
+	global _enumerator
+	size, supports = job
+	_enumerator.exclude_solutions(supports)
+	_enumerator.set_size_constraint(size, True)
+	sols = _enumerator.populate_current_size()
+	return size, [sol.var_values() for sol in sols]
+
+
 class KShortestEFMAlgorithm(object):
 	"""
 	A higher level class to use the K-Shortest algorithms. This encompasses the standard routine for enumeration of EFMs.
@@ -748,6 +969,11 @@ class KShortestEFMAlgorithm(object):
 		"""
 		assert self.configuration.has_required_properties(), "Algorithm configuration is missing required parameters."
 
+		# enumeration method and limits are read once per enumeration instead of at every get_enumerator call
+		self.__method = self.configuration[K_SHORTEST_MPROPERTY_METHOD]
+		self.__max_solutions = self.configuration[K_SHORTEST_OPROPERTY_MAXSOLUTIONS]
+		self.__max_size = self.configuration[K_SHORTEST_OPROPERTY_MAXSIZE]
+
 		self.ksh = KShortestEnumerator(
 			linear_system=linear_system,
 			m_value=self.configuration[K_SHORTEST_OPROPERTY_BIG_M_VALUE],
@@ -756,8 +982,12 @@ class KShortestEFMAlgorithm(object):
 			n_threads=self.configuration[K_SHORTEST_OPROPERTY_N_THREADS],
 			workmem=self.configuration[K_SHORTEST_OPROPERTY_WORKMEMORY],
 			force_big_m=self.configuration[K_SHORTEST_OPROPERTY_BIG_M_CONSTRAINTS],
-			max_populate_sols=self.configuration[K_SHORTEST_OPROPERTY_MAXSOLUTIONS],
-			max_time=self.configuration[K_SHORTEST_OPROPERTY_TIMELIMIT]
+			max_populate_sols=self.__max_solutions,
+			max_time=self.configuration[K_SHORTEST_OPROPERTY_TIMELIMIT],
+			pool_intensity=self.configuration[K_SHORTEST_OPROPERTY_POOL_INTENSITY],
+			pool_replace=self.configuration[K_SHORTEST_OPROPERTY_POOL_REPLACE],
+			mip_emphasis=self.configuration[K_SHORTEST_OPROPERTY_MIP_EMPHASIS],
+			fp_heuristic=self.configuration[K_SHORTEST_OPROPERTY_FP_HEURISTIC]
 		)
 		if excluded_sets is not None:
 			self.ksh.exclude_solutions(excluded_sets)
@@ -780,16 +1010,14 @@ class KShortestEFMAlgorithm(object):
 
 		-------
 
-		Returns a list with solutions encoding elementary flux modes.
+		Returns an iterator over the solutions encoding elementary flux modes. Solutions are computed lazily, so wrap
+		the result with list() if all of them are needed at once.
 
 		"""
 		enumerator = self.get_enumerator(linear_system, excluded_sets, forced_sets, initialize)
-		sols = list(enumerator)
-		if self.configuration[K_SHORTEST_MPROPERTY_METHOD] == K_SHORTEST_METHOD_POPULATE:
-			sols = list(chain(*sols))
-		# DEBUG
-		# linear_system.write_to_lp('test.lp')
-		return sols
+		if self.__method == K_SHORTEST_METHOD_POPULATE:
+			return chain.from_iterable(enumerator)
+		return enumerator
 
 	def get_enumerator(self, linear_system, excluded_sets, forced_sets, initialize=True):
 		"""
@@ -811,16 +1039,16 @@ class KShortestEFMAlgorithm(object):
 		if initialize:
 			self.prepare(linear_system, excluded_sets, forced_sets)
 
-		if self.configuration[K_SHORTEST_MPROPERTY_METHOD] == K_SHORTEST_METHOD_ITERATE:
-			limit = self.configuration[K_SHORTEST_OPROPERTY_MAXSOLUTIONS]
+		if self.__method == K_SHORTEST_METHOD_ITERATE:
+			limit = self.__max_solutions
 			if limit is None:
 				limit = 1
 				warnings.warn(Warning(
 					'You have not defined a maximum solution size for the enumeration process. Defaulting to 1.'))
 			return self.ksh.solution_iterator(limit)
 
-		elif self.configuration[K_SHORTEST_MPROPERTY_METHOD] == K_SHORTEST_METHOD_POPULATE:
-			limit = self.configuration[K_SHORTEST_OPROPERTY_MAXSIZE]
+		elif self.__method == K_SHORTEST_METHOD_POPULATE:
+			limit = self.__max_size
 			if limit is None:
 				warnings.warn(
 					Warning('You have not defined a maximum size for the enumeration process. Defaulting to size 1.'))
@@ -860,19 +1088,34 @@ class InterventionProblem(object):
 			constraints: An iterable containing valid constraints of
 
 		Returns a tuple (T,b) with two elements:
-			T is numpy 2D array with as many rows specifying individual bounds (lower and upper bounds count as two) for
-			each reaction.
+			T is a scipy.sparse.csr_matrix with as many rows specifying individual bounds (lower and upper bounds count
+			as two) for each reaction.
 
 			b is a numpy 1D array with the right hand side of the T.v > b inequality. This represents the value of the
 			bound.
 
+		Constraints whose materialize method still returns a (T, b) tuple with the dense rows of T are also accepted.
+
 		"""
-		constraint_pairs = [const.materialize(self.__num_rx) for const in constraints]
-		Tlist, blist = list(zip(*constraint_pairs))
+		rows, cols, data, b = [zeros(0, dtype=int32)], [zeros(0, dtype=int32)], [zeros(0)], [zeros(0)]
+		n_rows = 0
+		for const in constraints:
+			materialized = const.materialize(self.__num_rx)
+			if len(materialized) == 2:
+				# legacy constraints return the dense rows of T along with b
+				c_T, c_b = materialized
+				c_T = coo_matrix(array(c_T, ndmin=2))
+				c_rows, c_cols, c_data = c_T.row, c_T.col, c_T.data
+			else:
+				c_rows, c_cols, c_data, c_b = materialized
+			rows.append(asarray(c_rows, dtype=int32) + n_rows)
+			cols.append(asarray(c_cols, dtype=int32))
+			data.append(asarray(c_data, dtype=float64))
+			b.append(asarray(c_b, dtype=float64))
+			n_rows += len(c_b)
 
-		T = concatenate(Tlist, axis=0)
-		b = array(list(chain(*blist)))
-		return T, b
+		T = csr_matrix((concatenate(data), (concatenate(rows), concatenate(cols))), shape=(n_rows, self.__num_rx))
+		return T, concatenate(b)
 
 
 class AbstractConstraint(object):
@@ -884,14 +1127,15 @@ class AbstractConstraint(object):
 	@abc.abstractmethod
 	def materialize(self, n):
 		"""
-		Generates a matrix T 1-by-n or 2-by-n and a list b of length 1 or 2 to be used for target flux vector
-		definition within the intervention problem framework
+		Generates the nonzero entries of a target matrix T 1-by-n or 2-by-n and a list b of length 1 or 2 to be used
+		for target flux vector definition within the intervention problem framework
 
 		Parameters:
 
 			n: Number of columns to include in the target matrix
 
-		Returns: Tuple with Iterable[ndarray] and list of float/int
+		Returns: Tuple (rows, cols, data, b) with the row indices, column indices and values of the nonzero entries of
+		T (in coordinate format) and a list of float/int with the right hand side of each row
 
 		"""
 		return
@@ -910,14 +1154,29 @@ class AbstractConstraint(object):
 
 	@staticmethod
 	def convert_tuple_intervention_problem(tfluxes, tyields, reader):
-		target_flux_space = [tuple([k]) + tuple(v) for k, v in tfluxes.items()]
-		target_yield_space = [k + tuple(v) for k, v in tyields.items()]
-		converted_fbs = [DefaultFluxbound.from_tuple(reader.convert_constraint_ids(t, False)) for t in
-						 target_flux_space]
-		converted_ybs = [DefaultYieldbound.from_tuple(reader.convert_constraint_ids(t, True)) for t in
-						 target_yield_space]
+		r_index = reader.reaction_id_to_index
+		converted_fbs = [DefaultFluxbound(lb, ub, r_index(k)) for k, (lb, ub) in tfluxes.items()]
+		converted_ybs = [DefaultYieldbound.from_tuple((r_index(n), r_index(d)) + tuple(v))
+						 for (n, d), v in tyields.items()]
 		return converted_fbs, converted_ybs
 
+	@staticmethod
+	def pack_tuple_intervention_problem(tfluxes, tyields, reader):
+		"""
+		Packs an intervention problem specified as dicts (see convert_tuple_intervention_problem) into two array-based
+		constraints, one holding every flux bound and another holding every yield bound.
+
+		Returns a tuple (DefaultFluxboundArray, DefaultYieldboundArray)
+		"""
+		r_index = reader.reaction_id_to_index
+		fb_index = fromiter((r_index(k) for k in tfluxes.keys()), dtype=int32, count=len(tfluxes))
+		fb_lb, fb_ub = [array([v[i] for v in tfluxes.values()], dtype=float64) for i in range(2)]
+		yb_index = array([[r_index(n), r_index(d)] for n, d in tyields.keys()], dtype=int32).reshape(-1, 2)
+		yb_lb, yb_ub = [array([v[i] for v in tyields.values()], dtype=float64) for i in range(2)]
+		yb_dev = array([v[2] if len(v) > 2 else 0 for v in tyields.values()], dtype=float64)
+		return DefaultFluxbound.from_arrays(fb_index, fb_lb, fb_ub), \
+			   DefaultYieldbound.from_arrays(yb_index[:, 0], yb_index[:, 1], yb_lb, yb_ub, yb_dev)
+
 
 
 class DefaultFluxbound(AbstractConstraint):
@@ -941,20 +1200,19 @@ class DefaultFluxbound(AbstractConstraint):
 		self.__ub = ub
 
 	def materialize(self, n):
-		Tx = []
-		b = []
+		rows, cols, data, b = [], [], [], []
 		if self.__lb != None:
-			Tlb = zeros((1, n))
-			Tlb[0, self.__r_index] = -1
+			rows.append(len(b))
+			cols.append(self.__r_index)
+			data.append(-1)
 			b.append(-self.__lb)
-			Tx.append(Tlb)
 		if self.__ub != None:
-			Tub = zeros((1, n))
-			Tub[0, self.__r_index] = 1
+			rows.append(len(b))
+			cols.append(self.__r_index)
+			data.append(1)
 			b.append(self.__ub)
-			Tx.append(Tub)
 
-		return concatenate(Tx, axis=0), b
+		return rows, cols, data, b
 
 	@staticmethod
 	def from_tuple(tup):
@@ -967,6 +1225,17 @@ class DefaultFluxbound(AbstractConstraint):
 		index, lb, ub = tup
 		return DefaultFluxbound(lb, ub, index)
 
+	@staticmethod
+	def from_arrays(index, lb, ub):
+		"""
+
+		Returns a single DefaultFluxboundArray holding the bounds for several fluxes, from arrays of reaction indices
+		as well as lower and upper bounds (None or NaN for missing bounds).
+		-------
+
+		"""
+		return DefaultFluxboundArray(lb, ub, index)
+
 
 class DefaultYieldbound(AbstractConstraint):
 	"""
@@ -997,22 +1266,19 @@ class DefaultYieldbound(AbstractConstraint):
 		self.__deviation = deviation if not deviation is None else 0
 
 	def materialize(self, n):
-		Tx = []
-		b = []
+		rows, cols, data, b = [], [], [], []
 		if self.__lb != None:
-			Tlb = zeros((1, n))
-			Tlb[0, self.__numerator_index] = -1
-			Tlb[0, self.__denominator_index] = self.__lb
+			rows.extend([len(b)] * 2)
+			cols.extend([self.__numerator_index, self.__denominator_index])
+			data.extend([-1, self.__lb])
 			b.append(self.__deviation)
-			Tx.append(Tlb)
 		if self.__ub != None:
-			Tub = zeros((1, n))
-			Tub[0, self.__numerator_index] = 1
-			Tub[0, self.__denominator_index] = - self.__ub
+			rows.extend([len(b)] * 2)
+			cols.extend([self.__numerator_index, self.__denominator_index])
+			data.extend([1, - self.__ub])
 			b.append(self.__deviation)
-			Tx.append(Tub)
 
-		return concatenate(Tx, axis=0), b
+		return rows, cols, data, b
 
 	@staticmethod
 	def from_tuple(tup):
@@ -1029,4 +1295,132 @@ class DefaultYieldbound(AbstractConstraint):
 		else:
 			dev = 0
 
-		return DefaultYieldbound(ylb, yub, n, d, dev)
\ No newline at end of file
+		return DefaultYieldbound(ylb, yub, n, d, dev)
+
+	@staticmethod
+	def from_arrays(numerator_index, denominator_index, lb, ub, deviation=0):
+		"""
+
+		Returns a single DefaultYieldboundArray holding several yield constraints, from arrays of numerator and
+		denominator indices, yield lower and upper bounds and deviations (a single value or one per constraint).
+		-------
+
+		"""
+		return DefaultYieldboundArray(lb, ub, numerator_index, denominator_index, deviation)
+
+
+def _bound_row_offsets(has_lb, has_ub):
+	"""
+	Computes the target matrix rows for array-based constraints, keeping the lower bound row of each constraint
+	immediately before its upper bound row, as if each constraint had been materialized separately.
+
+	Returns a tuple (lb_rows, ub_rows, n_rows)
+	"""
+	row_counts = has_lb.astype(int32) + has_ub
+	first_rows = cumsum(row_counts) - row_counts
+	return first_rows[has_lb], (first_rows + has_lb)[has_ub], int(row_counts.sum())
+
+
+class DefaultFluxboundArray(AbstractConstraint):
+	"""
+	Class representing bounds for several fluxes, stored as parallel arrays of reaction indices and lower and upper
+	bounds. Materializes to the same rows as a sequence of DefaultFluxbound instances.
+	"""
+
+	def __init__(self, lb, ub, r_index):
+		"""
+		Parameters
+		----------
+			lb: Iterable with the numerical lower bounds. None (or NaN) means no lower bound
+
+			ub: Iterable with the numerical upper bounds. None (or NaN) means no upper bound
+
+			r_index: Iterable with the reaction indices on the stoichiometric matrix to which each bound belongs
+		"""
+		self.__r_index = asarray(r_index, dtype=int32)
+		self.__lb = array(lb, dtype=float64)
+		self.__ub = array(ub, dtype=float64)
+
+	def __len__(self):
+		return len(self.__r_index)
+
+	def materialize(self, n):
+		has_lb, has_ub = ~isnan(self.__lb), ~isnan(self.__ub)
+		lb_rows, ub_rows, n_rows = _bound_row_offsets(has_lb, has_ub)
+		rows = concatenate([lb_rows, ub_rows])
+		cols = concatenate([self.__r_index[has_lb], self.__r_index[has_ub]])
+		data = concatenate([-ones(len(lb_rows)), ones(len(ub_rows))])
+		b = zeros(n_rows)
+		b[lb_rows], b[ub_rows] = -self.__lb[has_lb], self.__ub[has_ub]
+
+		return rows, cols, data, b
+
+	@staticmethod
+	def from_tuple(tup):
+		"""
+
+		Returns a DefaultFluxboundArray instance from a tuple containing arrays of reaction indices as well as lower
+		and upper bounds.
+		-------
+
+		"""
+		index, lb, ub = tup
+		return DefaultFluxboundArray(lb, ub, index)
+
+
+class DefaultYieldboundArray(AbstractConstraint):
+	"""
+	Class representing several yield constraints (see DefaultYieldbound), stored as parallel arrays of numerator and
+	denominator indices, yield bounds and deviations.
+	"""
+
+	def __init__(self, lb, ub, numerator_index, denominator_index, deviation=0):
+		"""
+
+		Parameters
+		----------
+			lb: Iterable with the numerical lower bounds. None (or NaN) means no lower bound
+
+			ub: Iterable with the numerical upper bounds. None (or NaN) means no upper bound
+
+			numerator_index: Iterable with the reaction indices for the fluxes in the numerator
+
+			denominator_index: Iterable with the reaction indices for the fluxes in the denominator
+
+			deviation: Numerical deviation (or an iterable with one per constraint) for the target space
+		"""
+		self.__lb = array(lb, dtype=float64)
+		self.__ub = array(ub, dtype=float64)
+		self.__numerator_index = asarray(numerator_index, dtype=int32)
+		self.__denominator_index = asarray(denominator_index, dtype=int32)
+		deviation = zeros(len(self.__lb)) + array(0 if deviation is None else deviation, dtype=float64)
+		self.__deviation = where(isnan(deviation), 0, deviation)
+
+	def __len__(self):
+		return len(self.__numerator_index)
+
+	def materialize(self, n):
+		has_lb, has_ub = ~isnan(self.__lb), ~isnan(self.__ub)
+		lb_rows, ub_rows, n_rows = _bound_row_offsets(has_lb, has_ub)
+		rows = concatenate([repeat(lb_rows, 2), repeat(ub_rows, 2)])
+		cols = concatenate([column_stack([self.__numerator_index[mask], self.__denominator_index[mask]]).ravel()
+							for mask in (has_lb, has_ub)])
+		data = concatenate([column_stack([-ones(len(lb_rows)), self.__lb[has_lb]]).ravel(),
+							column_stack([ones(len(ub_rows)), -self.__ub[has_ub]]).ravel()])
+		b = zeros(n_rows)
+		b[lb_rows], b[ub_rows] = self.__deviation[has_lb], self.__deviation[has_ub]
+
+		return rows, cols, data, b
+
+	@staticmethod
+	def from_tuple(tup):
+		"""
+
+		Returns a DefaultYieldboundArray instance from a tuple containing arrays of numerator and denominator indices,
+		yield lower and upper bounds and deviations (optional)
+		-------
+
+		"""
+		n, d, ylb, yub = tup[:4]
+		dev = tup[4] if len(tup) > 4 else 0
+		return DefaultYieldboundArray(ylb, yub, n, d, dev)
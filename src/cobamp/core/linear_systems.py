@@ -6,6 +6,7 @@ from multiprocessing import cpu_count
 
 import numpy as np
 import optlang
+from scipy import sparse
 from optlang.symbolics import Zero
 
 CUSTOM_DEFAULT_SOLVER = None
@@ -63,7 +64,7 @@ def fix_backwards_irreversible_reactions(S, lb, ub):
 	 lb:
 	 ub:
 	"""
-	S = np.array(S)
+	S = S.toarray() if sparse.issparse(S) else np.array(S)
 	lb, ub = np.array(lb), np.array(ub)
 	fwd_irrev_index, bak_irrev_index = [[i for i in range(S.shape[1]) if fx(lb[i], ub[i])] for fx in
 										[fwd_irrev, bak_irrev]]
@@ -78,6 +79,21 @@ def fix_backwards_irreversible_reactions(S, lb, ub):
 	return S, lb, ub, fwd_irrev_index, bak_irrev_index
 
 
+def row_nonzero(S, i):
+	"""
+	Returns the column indices and values of the nonzero entries in a row of a matrix
+	Args:
+	 S: Two-dimensional np.ndarray or scipy.sparse.csr_matrix instance
+	 i: Row index
+	"""
+	if sparse.issparse(S):
+		start, end = S.indptr[i], S.indptr[i + 1]
+		return S.indices[start:end], S.data[start:end]
+	else:
+		cols = np.nonzero(S[i, :])[0]
+		return cols, S[i, cols]
+
+
 def make_irreversible_model(S, lb, ub):
 	# lb, ub = np.array(lb), np.array(ub)
 	# # fwd_irrev = lambda lb, ub: (lb >= 0) and (ub >= 0)
@@ -332,15 +348,18 @@ class LinearSystem():
 	def populate_constraints_from_matrix(self, S, constraints, vars, only_nonzero=False):
 		"""
 		Args:
-		  S: Two-dimensional np.ndarray instance
+		  S: Two-dimensional np.ndarray or scipy.sparse matrix instance
 		  constraints (side of all):
 		  vars: list of variable instances
 		  only_nonzero:
 		"""
+		if sparse.issparse(S):
+			S = S.tocsr() if only_nonzero else S.toarray()
+
 		if not only_nonzero:
 			coef_list = [{vars[j]: S[i, j] for j in range(S.shape[1])} for i in range(S.shape[0])]
 		else:
-			coef_list = [{vars[j]: S[i, j] for j in np.nonzero(S[i, :])[0]} for i in range(S.shape[0])]
+			coef_list = [{vars[j]: v for j, v in zip(*row_nonzero(S, i))} for i in range(S.shape[0])]
 
 		for coefs, constraint in zip(coef_list, constraints):
 			if constraint.indicator_variable is None:
@@ -352,7 +371,7 @@ class LinearSystem():
 	def add_rows_to_model(self, S_new, b_lb, b_ub, only_nonzero=False, indicator_rows=None, vars=None, names=None):
 		"""
 		Args:
-		  S_new:
+		  S_new: Two-dimensional np.ndarray or scipy.sparse matrix instance
 		  b_lb:
 		  b_ub:
 		  only_nonzero:
@@ -367,10 +386,12 @@ class LinearSystem():
 			constraints = [self.empty_constraint(b_lb[i], b_ub[i], name=names[i]) for i in range(S_new.shape[0])]
 		else:
 			constraints = [self.empty_constraint(b_lb[i], b_ub[i]) for i in range(S_new.shape[0])]
+		if sparse.issparse(S_new):
+			S_new = S_new.tocsr()
 		if indicator_rows:
 			for row, var_idx, complement in indicator_rows:
 				constraints[row] = self.interface.Constraint(
-					sum(S_new[row, i] * vars[i] for i in S_new[row, :].nonzero()[0]), lb=b_lb[row], ub=b_ub[row],
+					sum(v * vars[i] for i, v in zip(*row_nonzero(S_new, row))), lb=b_lb[row], ub=b_ub[row],
 					indicator_variable=vars[var_idx], active_when=complement)
 		self.model.add(constraints, sloppy=True)
 
@@ -775,6 +796,8 @@ class IrreversibleLinearPatternSystem(IrreversibleLinearSystem):
 class GenericDualLinearSystem(KShortestCompatibleLinearSystem, GenericLinearSystem):
 	def __init__(self, S, K, T, b, solver=None):
 		self.select_solver(solver)
+		S = S.toarray() if sparse.issparse(S) else S
+		T = T.toarray() if sparse.issparse(T) else T
 
 		self.__ivars = None
 		self.__c = "C"
@@ -831,8 +854,8 @@ class DualLinearSystem(KShortestCompatibleLinearSystem, GenericLinearSystem):
 		  dtype as float or int irrev: An Iterable[int] or ndarray containing the
 		  indices of irreversible reactions
 
-		  T: Target matrix as an ndarray. Should have c-by-n dimensions (c -
-		  #constraints; n - #fluxes)
+		  T: Target matrix as an ndarray or scipy.sparse matrix. Should have c-by-n
+		  dimensions (c - #constraints; n - #fluxes)
 
 		  b: Inhomogeneous bound values as a list or 1D ndarray of c size n.
 
@@ -845,6 +868,7 @@ class DualLinearSystem(KShortestCompatibleLinearSystem, GenericLinearSystem):
 		  solver:
 		"""
 		self.select_solver(solver)
+		T = T.toarray() if sparse.issparse(T) else T
 
 		S, lb, ub, fwd_irrev, bak_irrev = fix_backwards_irreversible_reactions(S, lb, ub)
 		irrev = np.union1d(fwd_irrev, bak_irrev).astype(int)
@@ -1,6 +1,5 @@
 import warnings
 from collections import OrderedDict, Counter
-from copy import deepcopy
 
 from numpy import ndarray, array, delete, zeros, vstack, hstack, nonzero, append, int_, int8, int16, \
 	int32, int64, where, isin
@@ -110,8 +109,10 @@ class ConstraintBasedModel(object):
 		self.__S = array(S)
 
 		self.bounds = self.__interpret_bounds(thermodynamic_constraints)
-		self.original_bounds = deepcopy(self.bounds)
-		self.reaction_names, self.metabolite_names = deepcopy(reaction_names), deepcopy(metabolite_names)
+		# bound entries are replaced rather than modified in place and names are strings, so shallow copies suffice
+		self.original_bounds = list(self.bounds)
+		self.reaction_names, self.metabolite_names = [None if names is None else list(names)
+													  for names in (reaction_names, metabolite_names)]
 
 		self.__update_decoder_map()
 
@@ -613,7 +614,7 @@ class CORSOModel(ConstraintBasedModel):
 
 		self.add_reaction(zeros(len(self.metabolite_names)), (0, 0), self.corso_rx)
 
-		self.original_bounds = deepcopy(self.bounds)
+		self.original_bounds = list(self.bounds)
 
 		for orx, nrx in self.mapping.items():
 			if isinstance(nrx, int):
@@ -4,7 +4,7 @@ from collections import OrderedDict
 from time import time
 
 import pandas as pd
-from numpy import nan, array, abs, zeros, max
+from numpy import nan, array, abs, zeros, max, ndarray
 from pathos.multiprocessing import cpu_count
 from pathos.pools import _ProcessPool
 
@@ -41,7 +41,8 @@ class Solution(object):
 		Parameters
 		----------
 
-			value_map: A dictionary mapping variable indexes with their values as determined by the solver
+			value_map: A dictionary mapping variable indexes with their values as determined by the solver, or a
+			ndarray with the values ordered by variable index
 
 			status: An object (preferrably str or int) containing the solution status
 
@@ -90,7 +91,7 @@ class Solution(object):
 	def var_values(self):
 		"""
 
-		Returns a dict mapping reaction indices with the variable values.
+		Returns a dict (or ndarray) mapping reaction indices with the variable values.
 		-------
 
 		"""
@@ -141,10 +142,14 @@ class Solution(object):
 	def x(self):
 		'''
 
-		Returns a ndarray with the solution values in order (from the variables)
+		Returns a ndarray with the solution values in order (from the variables). If the values are already stored as
+		an ndarray, a read-only view is returned so the solution cannot be modified through it.
 
 		'''
-
+		if isinstance(self.__value_map, ndarray):
+			values = self.__value_map.view()
+			values.flags.writeable = False
+			return values
 		return array(list(self.__value_map.values()))
 
 	def __repr__(self):
@@ -231,6 +236,22 @@ class LinearSystemOptimizer(object):
 			raise ValueError('The provided solver does not have an implemented populate function. Choose from' +
 							 ''.join(list(intf_dict.keys())))
 
+	def reset(self):
+		"""
+		Discards solver-side state left by previous runs (such as the solution pool) without rebuilding the optimizer or
+		the underlying model.
+		"""
+		intf_dict = {
+			'CPLEX': self.__reset_cplex
+		}
+		if self.solver in intf_dict:
+			intf_dict[self.solver]()
+
+	def __reset_cplex(self):
+		pool = self.model.problem.solution.pool
+		if pool.get_num() > 0:
+			pool.delete()
+
 	def __populate_cplex(self, limit=None):
 		instance = self.model.problem
 
@@ -448,7 +469,7 @@ class BatchOptimizer(object):
 
 class CORSOSolution(Solution):
 	def __init__(self, sol_max, sol_min, f, index_map, var_names, eps=1e-8):
-		x = sol_min.x()
+		x = sol_min.x().copy()
 		rev = index_map[max(index_map) + 1:]
 
 		nx = x[:max(index_map) + 1]
@@ -498,7 +519,7 @@ class KShortestSolution(Solution):
 
 		----------
 
-			value_map: A dictionary mapping variable names with values
+			value_map: A dictionary or ndarray mapping variable indices with values
 
 			status: See <Solution>
 
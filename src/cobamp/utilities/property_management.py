@@ -135,6 +135,18 @@ class PropertyDictionary():
 
 		return is_ok
 
+	def copy(self):
+		"""
+		Returns a shallow copy of this dictionary. The copy shares the mandatory/optional property definitions with
+		the original, but values set on it do not change the original.
+		-------
+
+		"""
+		new = self.__class__.__new__(self.__class__)
+		new.__dict__.update(self.__dict__)
+		new.__properties = dict(self.__properties)
+		return new
+
 	def add_if_not_none(self, key, value):
 		if value is not None:
 			self[key] = value
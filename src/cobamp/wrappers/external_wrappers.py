@@ -1,14 +1,26 @@
 import abc
+import sys
 import warnings
 
 import numpy as np
 from numpy import where
+from scipy import sparse
 
 from cobamp.core.models import ConstraintBasedModel
 from cobamp.gpr.core import GPRContainer
 
 MAX_PRECISION = 1e-10
 
+
+def _to_bound_array(bounds, unbounded_value):
+	"""
+	Converts a sequence of reaction bounds into a float numpy array, replacing None (no bound) with unbounded_value
+	"""
+	if isinstance(bounds, np.ndarray) and bounds.dtype != object:
+		return np.asarray(bounds, dtype=float)
+	return np.array([unbounded_value if b is None else b for b in bounds], dtype=float)
+
+
 class AbstractObjectReader(object):
 	"""
 	An abstract class for reading metabolic model objects from external frameworks, and extracting the data needed for
@@ -22,8 +34,8 @@ class AbstractObjectReader(object):
 
 		----------
 
-			model: A Model instance from the external framework to use. Must be registered in the dict stored as
-			external_wrappers.model_readers along with its reader.
+			model: A Model instance from the external framework to use. Its class must be registered in the tuple stored
+			as external_wrappers.MODEL_READERS along with its reader.
 
 		"""
 		self.model = model
@@ -34,15 +46,30 @@ class AbstractObjectReader(object):
 			This method re-initializes the class attributes from the current state of self.model
 		"""
 
-		self.r_ids, self.m_ids = self.get_reaction_and_metabolite_ids()
+		self.r_ids, self.m_ids = [tuple(ids) for ids in self.get_reaction_and_metabolite_ids()]
+		self._r_idx = {r_id: i for i, r_id in enumerate(self.r_ids)}
+		self._m_idx = {m_id: i for i, m_id in enumerate(self.m_ids)}
 		self.rx_instances = self.get_rx_instances()
 		self.S = self.get_stoichiometric_matrix()
-		self.lb, self.ub = tuple(zip(*self.get_model_bounds(False)))
-		self.irrev_bool = self.get_irreversibilities(False)
-		self.irrev_index = self.get_irreversibilities(True)
-		self.bounds_dict = self.get_model_bounds(True)
+		lb, ub = self.get_model_bounds(as_dict=False, separate_list=True)
+		self.lb, self.ub = _to_bound_array(lb, -np.inf), _to_bound_array(ub, np.inf)
+		self.irrev_bool = self._get_irreversibility_array()
+		self.irrev_index = np.flatnonzero(self.irrev_bool).astype(np.int32)
+		self.__bounds_dict = None
 		self.gene_protein_reaction_rules = gpr_and_char, gpr_or_char, gpr_gene_parse_function, ttg_ratio
 		self.__gpr_read_params = gpr_and_char, gpr_or_char, gpr_gene_parse_function, ttg_ratio
+
+	@property
+	def bounds_dict(self):
+		# only built when first requested since most callers use lb/ub directly
+		if self.__bounds_dict is None:
+			self.__bounds_dict = self.get_model_bounds(True)
+		return self.__bounds_dict
+
+	@bounds_dict.setter
+	def bounds_dict(self, value):
+		self.__bounds_dict = value
+
 	@property
 	def gene_protein_reaction_rules(self):
 		return self.__gene_protein_reaction_rules
@@ -59,8 +86,8 @@ class AbstractObjectReader(object):
 	@abc.abstractmethod
 	def get_stoichiometric_matrix(self):
 		"""
-		Returns a 2D numpy array with the stoichiometric matrix whose metabolite and reaction indexes match the names
-		defined in the class variables r_ids and m_ids
+		Returns a 2D numpy array or scipy.sparse matrix with the stoichiometric matrix whose metabolite and reaction
+		indexes match the names defined in the class variables r_ids and m_ids
 		"""
 		pass
 
@@ -95,6 +122,13 @@ class AbstractObjectReader(object):
 		"""
 		pass
 
+	def _get_irreversibility_array(self):
+		"""
+		Returns a boolean numpy array flagging irreversible reactions. Readers that already hold this array can
+		override this to avoid converting it from the list returned by get_irreversibilities.
+		"""
+		return np.array(self.get_irreversibilities(False), dtype=bool)
+
 	@abc.abstractmethod
 	def get_rx_instances(self):
 		"""
@@ -105,7 +139,8 @@ class AbstractObjectReader(object):
 	@abc.abstractmethod
 	def get_reaction_and_metabolite_ids(self):
 		"""
-		Returns two ordered iterables containing the metabolite and reaction ids respectively.
+		Returns two ordered iterables containing the reaction and metabolite ids respectively. These are stored as
+		tuples in r_ids and m_ids, with id-to-index lookups done through reaction_id_to_index/metabolite_id_to_index.
 		"""
 		pass
 
@@ -133,7 +168,7 @@ class AbstractObjectReader(object):
 			id: A reaction identifier as a string
 
 		"""
-		return self.r_ids.index(id)
+		return self._r_idx[id]
 
 	def metabolite_id_to_index(self, id):
 		"""
@@ -146,16 +181,16 @@ class AbstractObjectReader(object):
 			id: A metabolite identifier as a string
 
 		"""
-		return self.m_ids.index(id)
+		return self._m_idx[id]
 
 	def get_gene_protein_reaction_rule(self, id):
 		return self.gene_protein_reaction_rules[id]
 
 	def convert_constraint_ids(self, tup, yield_constraint):
 		if yield_constraint:
-			constraint = tuple(list(map(self.reaction_id_to_index, tup[:2])) + list(tup[2:]))
+			constraint = (self._r_idx[tup[0]], self._r_idx[tup[1]]) + tuple(tup[2:])
 		else:
-			constraint = tuple([self.reaction_id_to_index(tup[0])] + list(tup[1:]))
+			constraint = (self._r_idx[tup[0]],) + tuple(tup[1:])
 		return constraint
 
 
@@ -187,11 +222,12 @@ class AbstractObjectReader(object):
 			gpr_list=self.get_model_gpr_strings(),
 			and_char=and_char, or_char=or_char, apply_fx=gpr_gene_parse_function, ttg_ratio=ttg_ratio)
 
+		S = self.get_stoichiometric_matrix()
 		return ConstraintBasedModel(
-			S=self.get_stoichiometric_matrix(),
+			S=S.toarray() if sparse.issparse(S) else S,
 			thermodynamic_constraints=[tuple(float(k) for k in l) for l in self.get_model_bounds()],
-			reaction_names=self.r_ids,
-			metabolite_names=self.m_ids,
+			reaction_names=list(self.r_ids),
+			metabolite_names=list(self.m_ids),
 			optimizer= (solver == True) or (solver is not None and solver != False),
 			solver=solver if solver not in (True, False) else None,
 			gprs=ngprs
@@ -223,35 +259,67 @@ class COBRAModelObjectReader(AbstractObjectReader):
 			model = self.__read_model(model, format, **kwargs)
 		super().__init__(model, gpr_gene_parse_function=gpr_gene_parse_function, **kwargs)
 
-	def get_stoichiometric_matrix(self):
-		S = np.zeros((len(self.m_ids), len(self.r_ids)))
-		for i, r_id in enumerate(self.r_ids):
-			for metab, coef in self.model.reactions.get_by_id(r_id).metabolites.items():
-				S[self.m_ids.index(metab.id), i] = coef
+	def initialize(self, *args, **kwargs):
+		self.__rx_attributes = None
+		super().initialize(*args, **kwargs)
+
+	def __get_rx_attributes(self):
+		"""
+		Reads the bounds and reversibility of every reaction in a single pass over the reaction instances. The result
+		is cached until the reader is re-initialized.
+
+		Returns a tuple (lb, ub, irrev) of numpy arrays
+		"""
+		if self.__rx_attributes is None:
+			rx_instances = self.rx_instances
+			n = len(rx_instances)
+			lb, ub, irrev = np.empty(n), np.empty(n), np.empty(n, dtype=bool)
+			for i, r in enumerate(rx_instances):
+				lb[i], ub[i] = r.bounds
+				irrev[i] = not r.reversibility
+			self.__rx_attributes = lb, ub, irrev
+		return self.__rx_attributes
 
-		return S
+	def get_stoichiometric_matrix(self):
+		m_idx = self._m_idx
+		# Reaction.metabolites returns a copy on every access, so it is read only once per reaction
+		mets = [rx.metabolites for rx in self.rx_instances]
+		# the triplet buffers are sized up front from the number of metabolites in each reaction
+		counts = np.fromiter((len(rx_mets) for rx_mets in mets), dtype=np.int32, count=len(mets))
+		nnz = int(counts.sum())
+		rows = np.fromiter((m_idx[metab.id] for rx_mets in mets for metab in rx_mets), dtype=np.int32, count=nnz)
+		data = np.fromiter((coef for rx_mets in mets for coef in rx_mets.values()), dtype=float, count=nnz)
+		cols = np.repeat(np.arange(len(mets), dtype=np.int32), counts)
+
+		return sparse.csc_matrix((data, (rows, cols)), shape=(len(self.m_ids), len(self.r_ids)))
 
 	def get_model_bounds(self, as_dict=False, separate_list=False):
-		bounds = [r.bounds for r in self.rx_instances]
+		lb, ub, _ = self.__get_rx_attributes()
+		if separate_list and not as_dict:
+			# copies, so callers cannot modify the cached arrays
+			return [lb.copy(), ub.copy()]
+		bounds = tuple(zip(lb.tolist(), ub.tolist()))
 		if as_dict:
 			return dict(zip(self.r_ids, bounds))
 		else:
-			if separate_list:
-				return [list(bounds) for bounds in list(zip(*tuple(bounds)))]
-			else:
-				return tuple(bounds)
+			return bounds
 
 	def get_irreversibilities(self, as_index):
-		irrev = [not r.reversibility for r in self.rx_instances]
+		irrev = self.__get_rx_attributes()[2]
 		if as_index:
-			irrev = list(np.where(irrev)[0])
-		return irrev
+			return list(np.flatnonzero(irrev))
+		return irrev.tolist()
+
+	def _get_irreversibility_array(self):
+		return self.__get_rx_attributes()[2].copy()
 
 	def get_rx_instances(self):
-		return [self.model.reactions.get_by_id(rx) for rx in self.r_ids]
+		# r_ids are read from model.reactions in the same order, so there is no need to look each one up by id
+		return list(self.model.reactions)
 
 	def get_reaction_and_metabolite_ids(self):
-		return tuple([[x.id for x in lst] for lst in (self.model.reactions, self.model.metabolites)])
+		reactions, metabolites = self.model.reactions, self.model.metabolites
+		return tuple(r.id for r in reactions), tuple(m.id for m in metabolites)
 
 	def get_model_genes(self):
 		return set([g.id for g in self.model.genes])
@@ -359,18 +427,58 @@ class CobampModelObjectReader(AbstractObjectReader):
 	def get_model_gpr_strings(self):
 		return [self.model.gpr[i] for i in range(len(self.r_ids))]
 
-# This dict contains the mapping between model instance namespaces (without the class name itself) and the appropriate
-# model reader object. Modify this if a new reader is implemented.
+# This tuple contains (module, class name, reader) entries used to pick the appropriate reader for a model instance.
+# Model classes are only looked up in modules that have already been imported, so optional frameworks are never
+# imported by cobamp itself. Modify this if a new reader is implemented.
+
+MODEL_READERS = (
+	('cobra', 'Model', COBRAModelObjectReader),
+	('framed.model.cbmodel', 'CBModel', FramedModelObjectReader),
+	('cobamp.core.models', 'ConstraintBasedModel', CobampModelObjectReader),
+	('numpy', 'ndarray', MatFormatReader)
+)
+
+_model_reader_cache = {}
+
+
+def get_model_reader_class(model_obj):
+	"""
+	Finds the reader class for a model instance by matching its class against the entries in MODEL_READERS. The
+	result is cached per model class.
+
+	Parameters
+
+	----------
+
+		model_obj: A model instance from one of the supported frameworks
+
+	Returns a subclass of AbstractObjectReader. Raises a TypeError if no reader supports the model's class.
+	"""
+	model_type = type(model_obj)
+	if model_type not in _model_reader_cache:
+		for module_name, class_name, reader in MODEL_READERS:
+			module = sys.modules.get(module_name)
+			if module is not None and issubclass(model_type, getattr(module, class_name)):
+				_model_reader_cache[model_type] = reader
+				break
+		else:
+			raise TypeError('model_obj has an unknown type that could not be read with cobamp: ' + str(model_type) +
+							'. Currently available readers are: ' + ', '.join(r.__name__ for _, _, r in MODEL_READERS))
+	return _model_reader_cache[model_type]
 
-model_readers = {
-	'cobra.core.model': COBRAModelObjectReader,
-	'framed.model.cbmodel': FramedModelObjectReader,
-	'cobamp.core.models': CobampModelObjectReader,
-	'numpy': MatFormatReader
-}
 
 def get_model_reader(model_obj, **kwargs):
-	if type(model_obj).__module__ in model_readers.keys():
-		return model_readers[type(model_obj).__module__](model_obj, **kwargs)
-	else:
-		raise TypeError('model_obj has an unknown type that could not be read with cobamp:', type(model_obj).__module__)
\ No newline at end of file
+	"""
+	Builds the appropriate reader for a model instance (see get_model_reader_class).
+
+	Parameters
+
+	----------
+
+		model_obj: A model instance from one of the supported frameworks
+
+		kwargs: Additional arguments passed to the reader's constructor
+
+	Returns an AbstractObjectReader instance.
+	"""
+	return get_model_reader_class(model_obj)(model_obj, **kwargs)
@@ -1,7 +1,7 @@
 from cobamp.algorithms.kshortest import *
 from cobamp.core.linear_systems import IrreversibleLinearSystem, DualLinearSystem, IrreversibleLinearPatternSystem, \
 	GenericDualLinearSystem
-from cobamp.wrappers.external_wrappers import model_readers
+from cobamp.wrappers.external_wrappers import get_model_reader
 
 from itertools import product
 
@@ -24,6 +24,8 @@ class KShortestEnumeratorWrapper(object):
 		ALGORITHM_TYPE_POPULATE: K_SHORTEST_METHOD_POPULATE
 	}
 
+	__property_templates = {}
+
 	def __init__(self, model, algorithm_type=ALGORITHM_TYPE_POPULATE, stop_criteria=1, forced_solutions=None,
 				 excluded_solutions=None, solver='CPLEX', force_bounds={}, n_threads=0, workmem=None, big_m=False,
 				 max_populate_sols_override=None, time_limit=None, big_m_value=None, cut_function=None, extra_args=None,
@@ -34,8 +36,8 @@ class KShortestEnumeratorWrapper(object):
 
 		----------
 
-			model: A Model instance from the external framework to use. Must be registered in the dict stored as
-			external_wrappers.model_readers along with its reader.
+			model: A Model instance from the external framework to use. Its class must be registered in the tuple stored
+			as external_wrappers.MODEL_READERS along with its reader.
 
 			algorithm_type: ALGORITHM_TYPE_ITERATIVE or ALGORITHM_TYPE_POPULATE constants stored as class attributes.
 				ALGORITHM_TYPE_ITERATIVE is a slower method (regarding EFMs per unit of time) that enumerates EFMs one
@@ -61,15 +63,9 @@ class KShortestEnumeratorWrapper(object):
 		"""
 
 		self.__model = model
-		if type(model).__module__ in model_readers.keys():
-			self.model_reader = model_readers[type(model).__module__](model)
-		else:
-			raise TypeError(
-				"The `model` instance is not currently supported by cobamp. Currently available readers are: " + str(
-					list(model_readers.keys())))
+		self.model_reader = get_model_reader(model)
 
-		self.__algo_properties = KShortestProperties()
-		self.__algo_properties[K_SHORTEST_MPROPERTY_METHOD] = self.__alg_to_alg_name[algorithm_type]
+		self.__algo_properties = self._template_for(algorithm_type).copy()
 		self.__algo_properties[K_SHORTEST_MPROPERTY_TYPE_EFP] = self.is_efp
 		self.__algo_properties[K_SHORTEST_OPROPERTY_N_THREADS] = n_threads
 		self.__algo_properties[K_SHORTEST_OPROPERTY_WORKMEMORY] = workmem
@@ -97,22 +93,39 @@ class KShortestEnumeratorWrapper(object):
 		self.__forced_solutions = preprocess_cuts(forced_solutions)
 		self.__excluded_solutions = preprocess_cuts(excluded_solutions)
 
-		self.force_bounds = {self.model_reader.r_ids.index(k): v for k, v in force_bounds.items()}
+		self.force_bounds = {self.model_reader.reaction_id_to_index(k): v for k, v in force_bounds.items()}
 		self.solver = solver
 		self.pre_enum_function = pre_enum_function
 		self.cut_function = cut_function
 		self.extra_args = extra_args
-		self.__setup_algorithm()
+		self.__algo = None
 		self.enumerated_sols = []
 
-	def __setup_algorithm(self):
+	@classmethod
+	def _template_for(cls, algorithm_type):
 		"""
-		Creates the algorithms instance
-
-		Returns:
-
+		Returns a KShortestProperties instance with the defaults and the enumeration method for `algorithm_type`. It is
+		built once per algorithm type and should be copied before being modified.
+		"""
+		if algorithm_type not in cls.__property_templates:
+			template = KShortestProperties()
+			template[K_SHORTEST_MPROPERTY_METHOD] = cls.__alg_to_alg_name[algorithm_type]
+			cls.__property_templates[algorithm_type] = template
+		return cls.__property_templates[algorithm_type]
+
+	@property
+	def algo(self):
 		"""
-		self.algo = KShortestEFMAlgorithm(self.__algo_properties, False)
+		The KShortestEFMAlgorithm instance used by this wrapper. It is only created when first needed (usually by
+		get_enumerator).
+		"""
+		if self.__algo is None:
+			self.__algo = KShortestEFMAlgorithm(self.__algo_properties, False)
+		return self.__algo
+
+	@algo.setter
+	def algo(self, value):
+		self.__algo = value
 
 	def __get_forced_solutions(self):
 		"""
@@ -181,8 +194,8 @@ class KShortestEFMEnumeratorWrapper(KShortestEnumeratorWrapper):
 
 		----------
 
-			model: A Model instance from the external framework to use. Must be registered in the dict stored as
-			external_wrappers.model_readers along with its reader.
+			model: A Model instance from the external framework to use. Its class must be registered in the tuple stored
+			as external_wrappers.MODEL_READERS along with its reader.
 
 			non_consumed: An Iterable[int] or ndarray containing the indices of external metabolites not consumed in the
 			model.
@@ -270,11 +283,15 @@ class KShortestMCSEnumeratorWrapper(KShortestEnumeratorWrapper):
 	def __init__(self, model, target_flux_space_dict, target_yield_space_dict, **kwargs):
 		self.is_efp = False
 		super().__init__(model, **kwargs)
-		self.__ip_constraints = list(chain(*AbstractConstraint.convert_tuple_intervention_problem(
-			target_flux_space_dict, target_yield_space_dict, self.model_reader)))
+		self.__ip_constraints = AbstractConstraint.pack_tuple_intervention_problem(
+			target_flux_space_dict, target_yield_space_dict, self.model_reader)
+		self.__target_matrix = None
 
 	def materialize_intv_problem(self):
-		return InterventionProblem(self.model_reader.S).generate_target_matrix(self.__ip_constraints)
+		# the constraints and the model reader do not change after construction, so (T, b) is only built once
+		if self.__target_matrix is None:
+			self.__target_matrix = InterventionProblem(self.model_reader.S).generate_target_matrix(self.__ip_constraints)
+		return self.__target_matrix
 
 	def get_linear_system(self):
 		lb, ub = [array(k) for k in self.model_reader.get_model_bounds(separate_list=True, as_dict=False)]
@@ -287,10 +304,16 @@ class KShortestGenericMCSEnumeratorWrapper(KShortestEnumeratorWrapper):
 	def __init__(self, model, target_flux_space_dict, target_yield_space_dict, dual_matrix, dual_var_mapper, **kwargs):
 		self.is_efp = False
 		super().__init__(model, **kwargs)
-		self.__ip_constraints = list(chain(*AbstractConstraint.convert_tuple_intervention_problem(
-			target_flux_space_dict, target_yield_space_dict, self.model_reader)))
+		self.__ip_constraints = AbstractConstraint.pack_tuple_intervention_problem(
+			target_flux_space_dict, target_yield_space_dict, self.model_reader)
 
 		self.dual_matrix, self.dual_var_mapper = dual_matrix, {v:k for k,v in dual_var_mapper.items()}
+		self.__target_matrix = None
+
+	def materialize_intv_problem(self):
+		if self.__target_matrix is None:
+			self.__target_matrix = InterventionProblem(self.model_reader.S).generate_target_matrix(self.__ip_constraints)
+		return self.__target_matrix
 
 	def decode_k_shortest_solution(self, sol):
 		## TODO: Make MAX_PRECISION a parameter for linear systems or the KShortestAlgorithm
@@ -298,7 +321,7 @@ class KShortestGenericMCSEnumeratorWrapper(KShortestEnumeratorWrapper):
 		return {mapper[k]: sol.attribute_value(sol.SIGNED_VALUE_MAP)[k] for k in sol.get_active_indicator_varids()}
 
 	def get_linear_system(self):
-		T, b = InterventionProblem(self.model_reader.S).generate_target_matrix(self.__ip_constraints)
+		T, b = self.materialize_intv_problem()
 		return GenericDualLinearSystem(self.model_reader.S, self.dual_matrix, T, b, solver=self.solver)
 
 
@@ -0,0 +1,70 @@
+import unittest
+import numpy as np
+from scipy.sparse import coo_matrix
+from cobamp.algorithms.kshortest import InterventionProblem, AbstractConstraint, DefaultFluxbound, DefaultYieldbound, \
+	DefaultFluxboundArray, DefaultYieldboundArray
+
+
+class DenseFluxbound(AbstractConstraint):
+	"""
+	Flux bound materialized as dense rows of T, as constraints written for earlier versions do.
+	"""
+	def __init__(self, fbound):
+		self.fbound = fbound
+
+	def materialize(self, n):
+		rows, cols, data, b = self.fbound.materialize(n)
+		return coo_matrix((data, (rows, cols)), shape=(len(b), n)).toarray(), b
+
+	@staticmethod
+	def from_tuple(tup):
+		return DenseFluxbound(DefaultFluxbound.from_tuple(tup))
+
+
+class InterventionProblemTest(unittest.TestCase):
+	def setUp(self):
+		self.problem = InterventionProblem(np.zeros((2, 6)))
+		self.fluxes = [(0, 1, None), (3, None, 10), (5, -2, 4)]
+		self.yields = [(1, 2, 0.5, None, 0.1), (4, 0, None, 2, None), (3, 5, 0.2, 0.8, 0)]
+
+	def get_scalar_target_matrix(self):
+		constraints = [DefaultFluxbound.from_tuple(t) for t in self.fluxes] + \
+					  [DefaultYieldbound.from_tuple(t) for t in self.yields]
+		return self.problem.generate_target_matrix(constraints)
+
+	def get_array_target_matrix(self):
+		constraints = [DefaultFluxboundArray.from_tuple(tuple(zip(*self.fluxes))),
+					   DefaultYieldboundArray.from_tuple(tuple(zip(*self.yields)))]
+		return self.problem.generate_target_matrix(constraints)
+
+	def test_array_constraints_match_scalar_constraints(self):
+		T, b = self.get_scalar_target_matrix()
+		Ta, ba = self.get_array_target_matrix()
+		self.assertEqual(T.shape, (8, 6))
+		self.assertTrue(np.array_equal(T.toarray(), Ta.toarray()))
+		self.assertTrue(np.array_equal(b, ba))
+
+	def test_from_arrays(self):
+		fb_index, fb_lb, fb_ub = zip(*self.fluxes)
+		yb_num, yb_den, yb_lb, yb_ub, yb_dev = zip(*self.yields)
+		T, b = self.problem.generate_target_matrix([
+			DefaultFluxbound.from_arrays(fb_index, fb_lb, fb_ub),
+			DefaultYieldbound.from_arrays(yb_num, yb_den, yb_lb, yb_ub, yb_dev)])
+		Ts, bs = self.get_scalar_target_matrix()
+		self.assertTrue(np.array_equal(T.toarray(), Ts.toarray()))
+		self.assertTrue(np.array_equal(b, bs))
+
+	def test_dense_constraints_are_accepted(self):
+		T, b = self.problem.generate_target_matrix([DenseFluxbound.from_tuple(t) for t in self.fluxes])
+		Ts, bs = self.problem.generate_target_matrix([DefaultFluxbound.from_tuple(t) for t in self.fluxes])
+		self.assertTrue(np.array_equal(T.toarray(), Ts.toarray()))
+		self.assertTrue(np.array_equal(b, bs))
+
+	def test_empty_constraints(self):
+		T, b = self.problem.generate_target_matrix([DefaultFluxboundArray([], [], [])])
+		self.assertEqual(T.shape, (0, 6))
+		self.assertEqual(len(b), 0)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,126 @@
+from itertools import chain
+import unittest
+
+import numpy as np
+
+from cobamp.algorithms.kshortest import KShortestEnumerator
+from cobamp.core.linear_systems import IrreversibleLinearSystem
+
+TEST_SOLVER = 'CPLEX'
+
+
+class KShortestEnumeratorStateTests(unittest.TestCase):
+	def setUp(self):
+		S = np.array([[1, -1, 0, 0, -1, 0, -1, 0, 0],
+					  [0, 1, -1, 0, 0, 0, 0, 0, 0],
+					  [0, 1, 0, 1, -1, 0, 0, 0, 0],
+					  [0, 0, 0, 0, 0, 1, -1, 0, 0],
+					  [0, 0, 0, 0, 0, 0, 1, -1, 0],
+					  [0, 0, 0, 0, 1, 0, 0, 1, -1]])
+		lb, ub = [0] * S.shape[1], [1000] * S.shape[1]
+		lb[3] = -1000
+		self.make_enumerator = lambda: KShortestEnumerator(IrreversibleLinearSystem(S, lb, ub, solver=TEST_SOLVER))
+		self.enumerator = self.make_enumerator()
+
+	@staticmethod
+	def enumerate_supports(enumerator, max_size=9):
+		return sorted(tuple(sol.get_active_indicator_varids()) for sol in
+					  chain(*enumerator.population_iterator(max_size)))
+
+	def count_constraints(self):
+		model = self.enumerator.get_model().model
+		model.update()
+		return len(model.constraints)
+
+	def count_solver_rows(self):
+		return self.enumerator.get_model().model.problem.linear_constraints.get_num()
+
+	def test_cut_removal_keeps_model_and_solver_in_sync(self):
+		n_constraints, n_rows = self.count_constraints(), self.count_solver_rows()
+		tag = self.enumerator.checkpoint()
+		self.enumerator.exclude_solutions([[k] for k in range(9)])
+		self.enumerate_supports(self.enumerator)
+		self.assertTrue(self.count_constraints() > n_constraints)
+
+		self.enumerator.rollback(tag)
+		self.assertEqual(self.count_constraints(), n_constraints)
+		self.assertEqual(self.count_solver_rows(), n_rows)
+
+		self.enumerator.exclude_solutions([[4]])
+		self.enumerator.reset_enumerator_state()
+		self.assertEqual(self.count_constraints(), n_constraints)
+		self.assertEqual(self.count_solver_rows(), n_rows)
+
+	def test_duplicate_exclusion_is_added_once(self):
+		n_initial = self.count_constraints()
+		self.enumerator.exclude_solutions([[4]])
+		n_after_first = self.count_constraints()
+		self.enumerator.exclude_solutions([[4]])
+		n_after_second = self.count_constraints()
+		self.enumerator.exclude_solutions([[6], [6]])
+
+		self.assertEqual(n_after_first, n_initial + 1)
+		self.assertEqual(n_after_second, n_after_first)
+		self.assertEqual(self.count_constraints(), n_after_second + 1)
+
+	def test_populate_keeps_advanced_start_disabled(self):
+		self.enumerator.set_size_constraint(4, True)
+		self.enumerator.populate_current_size()
+		self.enumerator.set_size_constraint(5, True)
+		self.enumerator.populate_current_size()
+		self.assertEqual(self.enumerator.get_model().model.problem.parameters.advance.get(), 0)
+
+	def test_rollback_matches_fresh_enumeration(self):
+		fresh = self.enumerate_supports(self.make_enumerator())
+		tag = self.enumerator.checkpoint()
+		first = self.enumerate_supports(self.enumerator)
+		self.enumerator.rollback(tag)
+		second = self.enumerate_supports(self.enumerator)
+
+		self.assertTrue(len(fresh) > 0)
+		self.assertEqual(first, fresh)
+		self.assertEqual(second, fresh)
+
+	def test_rollback_keeps_cuts_before_checkpoint(self):
+		fresh_enumerator = self.make_enumerator()
+		fresh_enumerator.exclude_solutions([[4]])
+		fresh = self.enumerate_supports(fresh_enumerator)
+
+		self.enumerator.exclude_solutions([[4]])
+		tag = self.enumerator.checkpoint()
+		self.enumerator.exclude_solutions([[0]])
+		self.enumerate_supports(self.enumerator)
+		self.enumerator.rollback(tag)
+		self.assertEqual(self.enumerate_supports(self.enumerator), fresh)
+
+		# cuts added after the rollback are deduplicated against the restored state only
+		self.enumerator.rollback(tag)
+		n_cuts = self.count_constraints()
+		self.enumerator.exclude_solutions([[0]])
+		self.assertEqual(self.count_constraints(), n_cuts + 1)
+
+	def test_checkpoint_tags_are_not_reused(self):
+		first = self.enumerator.checkpoint()
+		self.enumerator.exclude_solutions([[4]])
+		second = self.enumerator.checkpoint()
+		self.enumerator.rollback(first)
+		third = self.enumerator.checkpoint()
+		self.assertEqual(len({first, second, third}), 3)
+
+		self.enumerator.checkpoint('user_tag')
+		with self.assertRaises(AssertionError):
+			self.enumerator.checkpoint('user_tag')
+		self.enumerator.checkpoint(third + 1)
+		self.assertNotIn(self.enumerator.checkpoint(), (first, third, third + 1))
+
+	def test_rollback_discards_later_checkpoints(self):
+		first = self.enumerator.checkpoint()
+		later = self.enumerator.checkpoint()
+		self.enumerator.rollback(first)
+		with self.assertRaises(AssertionError):
+			self.enumerator.rollback(later)
+		self.enumerator.rollback(first)
+
+
+if __name__ == '__main__':
+	unittest.main()
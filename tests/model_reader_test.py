@@ -0,0 +1,65 @@
+import unittest
+import numpy as np
+from cobamp.wrappers.external_wrappers import AbstractObjectReader
+
+
+class UnboundedModelReader(AbstractObjectReader):
+	"""
+	Minimal reader for a dict-based model. Missing bounds are returned as None, like the framed reader does.
+	"""
+	def get_stoichiometric_matrix(self):
+		return np.array(self.model['S'])
+
+	def get_model_bounds(self, as_dict=False, separate_list=False):
+		bounds = self.model['bounds']
+		if as_dict:
+			return dict(zip(self.r_ids, bounds))
+		elif separate_list:
+			return [list(b) for b in zip(*bounds)]
+		else:
+			return tuple(bounds)
+
+	def get_irreversibilities(self, as_index):
+		irrev = [lb is not None and lb >= 0 for lb, _ in self.model['bounds']]
+		return list(np.where(irrev)[0]) if as_index else irrev
+
+	def get_rx_instances(self):
+		return None
+
+	def get_reaction_and_metabolite_ids(self):
+		return self.model['reactions'], self.model['metabolites']
+
+	def get_model_gpr_strings(self):
+		return [''] * len(self.model['reactions'])
+
+
+class ModelReaderTest(unittest.TestCase):
+	def setUp(self):
+		self.reader = UnboundedModelReader({
+			'S': [[1, -1, 0], [0, 1, -1]],
+			'bounds': [(0, None), (None, None), (-5, 10)],
+			'reactions': ['R1', 'R2', 'R3'],
+			'metabolites': ['M1', 'M2']
+		})
+
+	def test_missing_bounds_are_infinite(self):
+		self.assertTrue(np.array_equal(self.reader.lb, [0, -np.inf, -5]))
+		self.assertTrue(np.array_equal(self.reader.ub, [np.inf, np.inf, 10]))
+		self.assertEqual(self.reader.bounds_dict['R2'], (None, None))
+
+	def test_bounds_dict_can_be_assigned(self):
+		self.reader.bounds_dict = {'R1': (0, 1)}
+		self.assertEqual(self.reader.bounds_dict, {'R1': (0, 1)})
+
+	def test_irreversibility_arrays(self):
+		self.assertTrue(np.array_equal(self.reader.irrev_bool, [True, False, False]))
+		self.assertEqual(self.reader.irrev_index.dtype, np.int32)
+		self.assertEqual(self.reader.irrev_index.tolist(), [0])
+
+	def test_ids_are_tuples(self):
+		self.assertEqual(self.reader.r_ids, ('R1', 'R2', 'R3'))
+		self.assertEqual(self.reader.metabolite_id_to_index('M2'), 1)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -68,6 +68,18 @@ class PropertyDictionaryTest(unittest.TestCase):
 		propdict_is_valid = propdict.has_required_properties()
 		self.assertTrue(not propdict_is_valid)
 
+
+	def test_copy_is_independent(self):
+		propdict = self.dict_class()
+		propdict['name'] = 'John'
+		propdict_copy = propdict.copy()
+		propdict_copy['name'] = 'Jane'
+		propdict_copy['age'] = 30
+
+		self.assertTrue(isinstance(propdict_copy, self.dict_class))
+		self.assertTrue((propdict['name'], propdict['age']) == ('John', None))
+		self.assertTrue((propdict_copy['name'], propdict_copy['age']) == ('Jane', 30))
+
 if __name__ == '__main__':
 	suite = unittest.TestLoader().loadTestsFromTestCase(PropertyDictionaryTest)
 	unittest.TextTestRunner(verbosity=2).run(suite)
@@ -39,6 +39,13 @@ class ToyMetabolicNetworkTests(unittest.TestCase):
 		mcss = list(chain(*solution_iterator))
 		return mcss
 
+	def enumerate_minimal_cut_sets_parallel(self):
+		dsystem = DualLinearSystem(self.S, self.lb, self.ub, self.T, self.b, solver='GUROBI')
+
+		ksh = KShortestEnumerator(dsystem)
+		mcss = list(chain(*ksh.populate_parallel(range(1, 5), workers=2)))
+		return mcss
+
 	def test_elementary_flux_modes_support(self):
 		basic_answer = {"R1, R2, R3, R4", "R1, R4, R5, R9", "R1, R2, R3, R5, R9", "R1, R6, R7, R8, R9"}
 		test = {self.convert_solution_to_string(sol) for sol in self.enumerate_elementary_flux_modes()}
@@ -50,6 +57,12 @@ class ToyMetabolicNetworkTests(unittest.TestCase):
 		test = {self.convert_solution_to_string(sol) for sol in self.enumerate_minimal_cut_sets()}
 		self.assertEqual(answer, test)
 
+	def test_minimal_cut_sets_parallel(self):
+		answer = {'R1', 'R2, R4, R6', 'R2, R4, R7', 'R2, R4, R8', 'R3, R4, R6', 'R3, R4, R7', 'R3, R4, R8', 'R5, R6',
+		          'R5, R7', 'R5, R8', 'R9'}
+		test = {self.convert_solution_to_string(sol) for sol in self.enumerate_minimal_cut_sets_parallel()}
+		self.assertEqual(answer, test)
+
 	def convert_solution_to_string(self, sol):
 		return ', '.join([self.rx_names[i] for i in sol.get_active_indicator_varids()])
 